@@ -9,6 +9,7 @@ import os
 import csv
 from datetime import datetime
 from collections import defaultdict
+from housing_stats_sketches import DistributionStats, INCOME_TIERS
 
 def analyze_data():
     # Define the input file
@@ -46,11 +47,15 @@ def analyze_data():
         # Total units across all projects
         total_units = 0
         
+        # Streaming quantile sketches and histograms per borough and income tier
+        distribution_stats = DistributionStats()
+        
         # Populate stats
         for record in data:
             # Borough stats
             borough = record.get('borough', 'Unknown')
             borough_stats[borough] += 1
+            distribution_stats.add_record(record)
             
             # Income level stats
             if 'extremely_low_income_units' in record and record['extremely_low_income_units'] != '0':
@@ -127,6 +132,30 @@ def analyze_data():
                      'July', 'August', 'September', 'October', 'November', 'December']:
             if month in months_2025:
                 print(f"{month}: {months_2025[month]} projects")
+        
+        print("\nUnit and Duration Distributions by Borough (median / p90; income tier units count projects without the tier as 0):")
+        summary = distribution_stats.summary()
+        for group, metrics in summary.items():
+            if not group.startswith('borough:'):
+                continue
+            print(f"{group.split(':', 1)[1]}:")
+            for metric, label in [('total_units', 'Total units'), ('duration_days', 'Start-to-completion days')]:
+                if metric in metrics:
+                    print(f"  {label}: {metrics[metric]['median']} / {metrics[metric]['p90']}")
+            for field, tier in INCOME_TIERS.items():
+                if field in metrics:
+                    print(f"  {tier} units: {metrics[field]['median']} / {metrics[field]['p90']}")
+        
+        print("\nUnits per Project by Income Tier (median / p90, projects without the tier count as 0):")
+        for field, tier in INCOME_TIERS.items():
+            metrics = summary.get(f"tier:{tier}")
+            if metrics:
+                print(f"{tier}: {metrics['units']['median']} / {metrics['units']['p90']}")
+        
+        # Save the sketches so they can be merged across shards or snapshots
+        sketches_file = "./data/housing_distribution_sketches.json"
+        distribution_stats.save(sketches_file)
+        print(f"\nDistribution sketches saved to {sketches_file}")
                 
         # Write data to CSV for easy use
         csv_file = "./data/nyc_housing_2025.csv"
@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+This script runs a long-lived data service that keeps the filtered NYC
+affordable housing data and the Housing Connect listings in memory, so the
+Node server can query them without reparsing the JSON files on every request.
+
+The service listens on HTTP (default 127.0.0.1:5055) or on a Unix socket
+(--socket PATH) and accepts batched queries:
+
+    POST /query
+    {"requests": [
+        {"op": "filter", "dataset": "projects",
+         "where": {"borough": "Brooklyn"},
+         "range": {"total_units": [100, null]}, "limit": 20},
+        {"op": "aggregate", "dataset": "projects",
+         "group_by": "borough", "sum": ["total_units"]},
+        {"op": "lookup", "dataset": "projects",
+         "key": "project_id", "value": "67899"},
+        {"op": "filter", "dataset": "listings", "ami": 60,
+         "contains": {"unit_sizes": "2br"},
+         "range": {"application_deadline": ["2025-06-01", null]}}
+    ]}
+
+Filters and aggregates also accept "contains", "search" and "ami"
+predicates; see _build_predicate.
+
+Every request in a batch is answered from the same snapshot, and each one
+gets its own {"ok": ..., "data"/"error": ...} entry in "results". The data
+files are polled for changes and, when the pipeline publishes new outputs,
+a fresh snapshot is built and swapped in as a whole; if the new files cannot
+be parsed, the previous snapshot keeps serving.
+
+Other endpoints: GET /health, POST /reload.
+"""
+
+import argparse
+import json
+import os
+import re
+import socket
+import stat
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+
+# Datasets served, keyed by the name used in requests
+DATASETS = {
+    'projects': "./data/filtered_nyc_affordable_housing_data.json",
+    'listings': "./data/housingListings.json",
+}
+
+# Fields that get an exact-match index per dataset (values are lowercased)
+INDEXED_FIELDS = {
+    'projects': ['project_id', 'project_name', 'borough', 'postcode'],
+    'listings': ['project_name'],
+}
+
+# Listings give their AMI range as text like "40%-80% AMI"
+AMI_RANGE_PATTERN = re.compile(r'(\d+)%\s*-\s*(\d+)%')
+
+DEFAULT_LIMIT = 100
+MAX_BATCH_SIZE = 100
+
+
+def _normalize(value):
+    """Normalize a value for case-insensitive exact matching.
+
+    Every field in the dataset is a string, so numbers sent by clients
+    (e.g. a project_id of 67899) are compared in their string form.
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        value = str(value)
+    if isinstance(value, str):
+        return value.strip().lower()
+    return value
+
+
+def _to_number(value):
+    """Convert numeric strings from the dataset to numbers, or return None."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value) if '.' in value else int(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _parse_ami_bounds(record):
+    """Return (minimum, maximum) AMI percentages of a listing, or None."""
+    match = AMI_RANGE_PATTERN.search(str(record.get('ami_range', '')))
+    if not match:
+        return None
+    return int(match.group(1)), int(match.group(2))
+
+
+def _contains(value, text):
+    """Case-insensitive substring match; list fields match on any element."""
+    if value is None:
+        return False
+    if isinstance(value, list):
+        return any(_contains(item, text) for item in value)
+    return text in str(value).lower()
+
+
+class DataSnapshot:
+    """An immutable view of all datasets and their indexes."""
+
+    def __init__(self, version, datasets, mtimes):
+        self.version = version
+        self.datasets = datasets
+        self.mtimes = mtimes
+        self.loaded_at = time.time()
+        self.indexes = {}
+
+        for name, records in datasets.items():
+            dataset_indexes = {}
+            for field in INDEXED_FIELDS.get(name, []):
+                index = defaultdict(list)
+                for position, record in enumerate(records):
+                    if field in record:
+                        index[_normalize(record[field])].append(position)
+                dataset_indexes[field] = dict(index)
+            self.indexes[name] = dataset_indexes
+
+        # AMI bounds are parsed once per listing rather than on every query
+        self.ami_bounds = {
+            name: [_parse_ami_bounds(record) for record in records]
+            for name, records in datasets.items()
+        }
+
+    def records(self, dataset):
+        if dataset not in self.datasets:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        return self.datasets[dataset]
+
+    def candidates(self, dataset, where):
+        """Narrow the scan using the most selective index that applies.
+
+        Returns the positions of the records worth checking.
+        """
+        records = self.records(dataset)
+        best = None
+        for field, value in where.items():
+            index = self.indexes[dataset].get(field)
+            if index is None:
+                continue
+            positions = index.get(_normalize(value), [])
+            if best is None or len(positions) < len(best):
+                best = positions
+        if best is None:
+            return range(len(records))
+        return best
+
+
+def load_snapshot(version, previous=None):
+    """Read every dataset from disk and build a new snapshot.
+
+    A missing file is served as an empty dataset only if it was also missing
+    from the previous snapshot (or on the first load); a file that disappears
+    while the service runs is treated as a failed load.
+    """
+    datasets = {}
+    mtimes = {}
+    for name, path in DATASETS.items():
+        if not os.path.exists(path):
+            if previous is not None and previous.mtimes.get(name) is not None:
+                raise OSError(f"{path} is missing")
+            print(f"Warning: {path} not found, serving {name} as empty")
+            datasets[name] = []
+            mtimes[name] = None
+            continue
+        mtimes[name] = os.path.getmtime(path)
+        with open(path, 'r') as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError(f"{path} does not contain a list of records")
+        datasets[name] = data
+    return DataSnapshot(version, datasets, mtimes)
+
+
+def current_mtimes():
+    return {
+        name: os.path.getmtime(path) if os.path.exists(path) else None
+        for name, path in DATASETS.items()
+    }
+
+
+class DataStore:
+    """Holds the current snapshot and replaces it when the files change."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = load_snapshot(1)
+        # File modification times of the last failed reload, so a file that
+        # stays broken is not re-parsed on every poll
+        self._failed_mtimes = None
+
+    @property
+    def snapshot(self):
+        # Readers take a reference once per batch; the swap below replaces
+        # the whole snapshot so a batch never sees a half-reloaded state.
+        return self._snapshot
+
+    def reload(self, force=False):
+        with self._lock:
+            old = self._snapshot
+            mtimes = None
+            try:
+                mtimes = current_mtimes()
+                if not force and mtimes in (old.mtimes, self._failed_mtimes):
+                    return False
+                new = load_snapshot(old.version + 1, previous=old)
+            except (OSError, ValueError) as e:
+                print(f"Reload failed, keeping version {old.version}: {e}")
+                self._failed_mtimes = mtimes
+                return False
+            self._failed_mtimes = None
+            self._snapshot = new
+            sizes = ", ".join(f"{name}={len(records)}" for name, records in new.datasets.items())
+            print(f"Loaded data version {new.version} ({sizes})")
+            return True
+
+    def watch(self, interval):
+        def poll():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.reload()
+                except Exception as e:
+                    print(f"Error checking for new data: {e}")
+
+        thread = threading.Thread(target=poll, daemon=True)
+        thread.start()
+        return thread
+
+
+def _matches(record, where, ranges):
+    for field, value in where.items():
+        if _normalize(record.get(field)) != _normalize(value):
+            return False
+    for field, bounds in ranges.items():
+        low, high = bounds
+        raw = record.get(field)
+        if raw is None:
+            return False
+        # Numeric fields compare as numbers, everything else (e.g. ISO dates)
+        # compares as strings
+        number, low_number, high_number = _to_number(raw), _to_number(low), _to_number(high)
+        if (number is not None
+                and (low is None or low_number is not None)
+                and (high is None or high_number is not None)):
+            raw, low, high = number, low_number, high_number
+        else:
+            raw = str(raw)
+            low = None if low is None else str(low)
+            high = None if high is None else str(high)
+        if low is not None and raw < low:
+            return False
+        if high is not None and raw > high:
+            return False
+    return True
+
+
+def _build_predicate(snapshot, dataset, request):
+    """Return a (position, record) -> bool check for a filter or aggregate.
+
+    Supported predicates, all of which must hold:
+      where:    {field: value} exact, case-insensitive match
+      range:    {field: [low, high]} inclusive bounds, either may be null
+      contains: {field: text} case-insensitive substring match
+      search:   {"text": text, "fields": [...]} substring match in any field
+      ami:      percentage that must fall within a listing's AMI range
+    """
+    where = request.get('where') or {}
+    ranges = request.get('range') or {}
+    contains = request.get('contains') or {}
+    search = request.get('search')
+    ami = request.get('ami')
+
+    for field, bounds in ranges.items():
+        if not isinstance(bounds, list) or len(bounds) != 2:
+            raise ValueError(f"range for {field} must be [low, high]")
+    for field, text in contains.items():
+        if not isinstance(text, str):
+            raise ValueError(f"contains value for {field} must be a string")
+    contains = {field: text.lower() for field, text in contains.items()}
+    if search is not None:
+        if (not isinstance(search, dict) or not isinstance(search.get('text'), str)
+                or not isinstance(search.get('fields'), list)):
+            raise ValueError("search must be {\"text\": string, \"fields\": [field, ...]}")
+        search_text = search['text'].lower()
+    if ami is not None and _to_number(ami) is None:
+        raise ValueError("ami must be a number")
+
+    ami_bounds = snapshot.ami_bounds[dataset]
+
+    def predicate(position, record):
+        if not _matches(record, where, ranges):
+            return False
+        for field, text in contains.items():
+            if not _contains(record.get(field), text):
+                return False
+        if search is not None and not any(
+                _contains(record.get(field), search_text) for field in search['fields']):
+            return False
+        if ami is not None:
+            bounds = ami_bounds[position]
+            if bounds is None or not bounds[0] <= _to_number(ami) <= bounds[1]:
+                return False
+        return True
+
+    return predicate
+
+
+def run_filter(snapshot, request):
+    dataset = request.get('dataset', 'projects')
+    where = request.get('where') or {}
+    fields = request.get('fields')
+    limit = request.get('limit', DEFAULT_LIMIT)
+    offset = request.get('offset', 0)
+
+    records = snapshot.records(dataset)
+    predicate = _build_predicate(snapshot, dataset, request)
+    matched = [
+        records[position]
+        for position in snapshot.candidates(dataset, where)
+        if predicate(position, records[position])
+    ]
+    page = matched[offset:offset + limit] if limit is not None else matched[offset:]
+    if fields:
+        page = [{field: record.get(field) for field in fields} for record in page]
+    return {'total': len(matched), 'records': page}
+
+
+def run_aggregate(snapshot, request):
+    dataset = request.get('dataset', 'projects')
+    where = request.get('where') or {}
+    group_by = request.get('group_by')
+    sum_fields = request.get('sum') or []
+
+    records = snapshot.records(dataset)
+    predicate = _build_predicate(snapshot, dataset, request)
+    groups = defaultdict(lambda: {'count': 0, 'sums': defaultdict(int)})
+    for position in snapshot.candidates(dataset, where):
+        record = records[position]
+        if not predicate(position, record):
+            continue
+        key = record.get(group_by, 'Unknown') if group_by else 'all'
+        group = groups[key]
+        group['count'] += 1
+        for field in sum_fields:
+            number = _to_number(record.get(field))
+            if number is not None:
+                group['sums'][field] += number
+
+    return {
+        str(key): {'count': group['count'], 'sums': {f: group['sums'][f] for f in sum_fields}}
+        for key, group in groups.items()
+    }
+
+
+def run_lookup(snapshot, request):
+    dataset = request.get('dataset', 'projects')
+    key = request.get('key')
+    index = snapshot.indexes.get(dataset, {}).get(key)
+    if index is None:
+        raise ValueError(f"{key} is not an indexed field of {dataset}")
+    records = snapshot.records(dataset)
+    values = request.get('values')
+    if values is None:
+        values = [request.get('value')]
+    return {
+        str(value): [records[position] for position in index.get(_normalize(value), [])]
+        for value in values
+    }
+
+
+OPERATIONS = {
+    'filter': run_filter,
+    'aggregate': run_aggregate,
+    'lookup': run_lookup,
+}
+
+
+def handle_batch(store, payload):
+    """Answer every request in a batch against a single snapshot."""
+    requests = payload.get('requests')
+    if not isinstance(requests, list):
+        raise ValueError("Body must contain a 'requests' list")
+    if len(requests) > MAX_BATCH_SIZE:
+        raise ValueError(f"Batch too large (max {MAX_BATCH_SIZE} requests)")
+
+    snapshot = store.snapshot
+    results = []
+    for request in requests:
+        try:
+            operation = OPERATIONS.get(request.get('op'))
+            if operation is None:
+                raise ValueError(f"Unknown op: {request.get('op')}")
+            results.append({'ok': True, 'data': operation(snapshot, request)})
+        except (ValueError, TypeError, AttributeError) as e:
+            results.append({'ok': False, 'error': str(e)})
+    return {'version': snapshot.version, 'results': results}
+
+
+class DataRequestHandler(BaseHTTPRequestHandler):
+    store = None
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': 'Not found'})
+            return
+        snapshot = self.store.snapshot
+        self._send_json(200, {
+            'status': 'ok',
+            'version': snapshot.version,
+            'loaded_at': snapshot.loaded_at,
+            'records': {name: len(records) for name, records in snapshot.datasets.items()},
+        })
+
+    def do_POST(self):
+        if self.path == '/reload':
+            reloaded = self.store.reload(force=True)
+            self._send_json(200, {'reloaded': reloaded, 'version': self.store.snapshot.version})
+            return
+        if self.path != '/query':
+            self._send_json(404, {'error': 'Not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("Body must be a JSON object")
+            self._send_json(200, handle_batch(self.store, payload))
+        except ValueError as e:
+            self._send_json(400, {'error': str(e)})
+
+    def log_message(self, format, *args):
+        # Unix socket clients have no address, and per-query logging is too noisy
+        pass
+
+
+def prepare_socket_path(path):
+    """Remove a stale socket at path; return an error message if it can't be used."""
+    if not os.path.exists(path):
+        return None
+    if not stat.S_ISSOCK(os.stat(path).st_mode):
+        return f"{path} exists and is not a socket"
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+        return f"another process is already listening on {path}"
+    except OSError:
+        # Nobody is listening, so this is left over from a previous run
+        os.remove(path)
+        return None
+    finally:
+        probe.close()
+
+
+class ThreadingUnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve housing data from memory")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--socket', help="Listen on this Unix socket path instead of HTTP")
+    parser.add_argument('--poll-interval', type=float, default=5.0,
+                        help="Seconds between checks for new pipeline outputs")
+    args = parser.parse_args()
+
+    if args.socket:
+        error = prepare_socket_path(args.socket)
+        if error:
+            print(f"Error: {error}")
+            return 1
+
+    try:
+        store = DataStore()
+    except (OSError, ValueError) as e:
+        print(f"Error: could not load data: {e}")
+        return 1
+
+    snapshot = store.snapshot
+    sizes = ", ".join(f"{name}={len(records)}" for name, records in snapshot.datasets.items())
+    print(f"Loaded data version {snapshot.version} ({sizes})")
+
+    DataRequestHandler.store = store
+    store.watch(args.poll_interval)
+
+    try:
+        if args.socket:
+            server = ThreadingUnixHTTPServer(args.socket, DataRequestHandler)
+            print(f"Housing data service listening on unix:{args.socket}")
+        else:
+            server = ThreadingHTTPServer((args.host, args.port), DataRequestHandler)
+            print(f"Housing data service listening on http://{args.host}:{args.port}")
+    except OSError as e:
+        print(f"Error: could not start server: {e}")
+        return 1
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.socket and os.path.exists(args.socket):
+            os.remove(args.socket)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory distribution statistics for the NYC affordable housing data.
+
+Quantiles are tracked with a KLL-style compactor sketch and distributions with
+fixed-bin histograms. Both are updated one value at a time during the pass
+over the records, serialize to plain JSON, and merge without the raw data, so
+results from several shards or daily snapshots can be combined later:
+
+    python housing_stats_sketches.py merge combined.json day1.json day2.json
+    python housing_stats_sketches.py summary ./data/housing_distribution_sketches.json
+"""
+
+import json
+import math
+import sys
+from datetime import datetime
+
+# Income tier fields in the dataset and the labels used in reports
+INCOME_TIERS = {
+    'extremely_low_income_units': 'Extremely Low Income',
+    'very_low_income_units': 'Very Low Income',
+    'low_income_units': 'Low Income',
+    'moderate_income_units': 'Moderate Income',
+    'middle_income_units': 'Middle Income',
+    'other_income_units': 'Other Income Levels',
+}
+
+# Histogram bin edges per metric; values outside the edges are counted as
+# underflow/overflow so the bins stay fixed across shards
+UNIT_BIN_EDGES = [0, 10, 25, 50, 100, 200, 500, 1000]
+DURATION_BIN_EDGES = [0, 180, 365, 545, 730, 910, 1095, 1460, 1825, 3650]
+
+METRIC_BIN_EDGES = {
+    'total_units': UNIT_BIN_EDGES,
+    'duration_days': DURATION_BIN_EDGES,
+    'units': UNIT_BIN_EDGES,
+}
+
+DEFAULT_K = 200
+
+
+class QuantileSketch:
+    """A mergeable KLL quantile sketch holding O(k log n) values."""
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.count = 0
+        self.min = None
+        self.max = None
+        self.compactors = [[]]
+        self._offset = 0
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, value):
+        self.compactors[0].append(value)
+        self.count += 1
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if len(self.compactors[0]) >= self._capacity(0):
+            self._compress()
+
+    def _compress(self):
+        level = 0
+        while level < len(self.compactors):
+            items = self.compactors[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                items.sort()
+                # An odd item out stays behind so total weight is preserved
+                keep = [items.pop()] if len(items) % 2 else []
+                # Alternate which half of each pair survives to avoid bias
+                self.compactors[level + 1].extend(items[self._offset::2])
+                self._offset ^= 1
+                self.compactors[level] = keep
+                # Adding a level shrinks the capacities below it
+                level = 0
+                continue
+            level += 1
+
+    def merge(self, other):
+        # Levels carry their weight (2 ** level), so sketches built with a
+        # different k merge correctly; the result keeps this sketch's k
+        if other.count == 0:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.count += other.count
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Return the approximate value at rank q (0 <= q <= 1)."""
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        weighted = sorted(
+            (value, 2 ** level)
+            for level, items in enumerate(self.compactors)
+            for value in items
+        )
+        total = sum(weight for _, weight in weighted)
+        target = q * total
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return self.max
+
+    def to_dict(self):
+        return {
+            'k': self.k,
+            'count': self.count,
+            'min': self.min,
+            'max': self.max,
+            'compactors': self.compactors,
+            'offset': self._offset,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data.get('k', DEFAULT_K))
+        sketch.count = data['count']
+        sketch.min = data['min']
+        sketch.max = data['max']
+        sketch.compactors = [list(items) for items in data['compactors']] or [[]]
+        sketch._offset = data.get('offset', 0)
+        return sketch
+
+
+class Histogram:
+    """A fixed-bin histogram; bins are [edges[i], edges[i + 1])."""
+
+    def __init__(self, edges):
+        self.edges = list(edges)
+        self.counts = [0] * (len(self.edges) - 1)
+        self.underflow = 0
+        self.overflow = 0
+
+    def update(self, value):
+        if value < self.edges[0]:
+            self.underflow += 1
+            return
+        if value >= self.edges[-1]:
+            self.overflow += 1
+            return
+        for i in range(len(self.counts)):
+            if value < self.edges[i + 1]:
+                self.counts[i] += 1
+                return
+
+    def merge(self, other):
+        if other.edges != self.edges:
+            raise ValueError("Cannot merge histograms with different bin edges")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.underflow += other.underflow
+        self.overflow += other.overflow
+        return self
+
+    def to_dict(self):
+        return {
+            'edges': self.edges,
+            'counts': self.counts,
+            'underflow': self.underflow,
+            'overflow': self.overflow,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        histogram = cls(data['edges'])
+        histogram.counts = list(data['counts'])
+        histogram.underflow = data['underflow']
+        histogram.overflow = data['overflow']
+        return histogram
+
+
+class MetricStats:
+    """A quantile sketch and a histogram for one metric in one group."""
+
+    def __init__(self, edges, k=DEFAULT_K):
+        self.sketch = QuantileSketch(k)
+        self.histogram = Histogram(edges)
+
+    def update(self, value):
+        self.sketch.update(value)
+        self.histogram.update(value)
+
+    def merge(self, other):
+        # Check before touching either side so a failed merge changes nothing
+        if other.histogram.edges != self.histogram.edges:
+            raise ValueError("Cannot merge histograms with different bin edges")
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+        return self
+
+    def summary(self):
+        return {
+            'count': self.sketch.count,
+            'min': self.sketch.min,
+            'median': self.sketch.quantile(0.5),
+            'p90': self.sketch.quantile(0.9),
+            'max': self.sketch.max,
+        }
+
+    def to_dict(self):
+        return {'sketch': self.sketch.to_dict(), 'histogram': self.histogram.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data['histogram']['edges'])
+        stats.sketch = QuantileSketch.from_dict(data['sketch'])
+        stats.histogram = Histogram.from_dict(data['histogram'])
+        return stats
+
+
+class DistributionStats:
+    """Per-group, per-metric distribution statistics.
+
+    Groups are named "all", "borough:<name>" and "tier:<label>"; metrics are
+    "total_units", "duration_days", one "<tier field>" per income tier within
+    a borough, and "units" within a tier group.
+
+    Income tier metrics are units per project over every project, not only
+    those that offer the tier: the dataset leaves out tiers with no units, so
+    a missing tier field is recorded as 0.
+    """
+
+    def __init__(self, k=DEFAULT_K):
+        self.k = k
+        self.records = 0
+        self.groups = {}
+
+    def add(self, group, metric, value):
+        metrics = self.groups.setdefault(group, {})
+        if metric not in metrics:
+            edges = METRIC_BIN_EDGES.get(metric, UNIT_BIN_EDGES)
+            metrics[metric] = MetricStats(edges, self.k)
+        metrics[metric].update(value)
+
+    def add_record(self, record):
+        """Update every group the record belongs to."""
+        self.records += 1
+        borough_group = f"borough:{record.get('borough', 'Unknown')}"
+
+        total_units = _parse_int(record.get('total_units'))
+        if total_units is not None:
+            self.add('all', 'total_units', total_units)
+            self.add(borough_group, 'total_units', total_units)
+
+        duration = _duration_days(record)
+        if duration is not None:
+            self.add('all', 'duration_days', duration)
+            self.add(borough_group, 'duration_days', duration)
+
+        for field, label in INCOME_TIERS.items():
+            units = _parse_int(record.get(field, 0))
+            if units is None:
+                continue
+            self.add(borough_group, field, units)
+            self.add(f"tier:{label}", 'units', units)
+
+    def merge(self, other):
+        # A differing k in other is not an error: metrics both sides have
+        # keep this object's k, metrics only other has are copied with theirs
+        for group, metrics in other.groups.items():
+            for metric, stats in metrics.items():
+                own = self.groups.get(group, {}).get(metric)
+                if own is not None and own.histogram.edges != stats.histogram.edges:
+                    raise ValueError(f"Cannot merge {group} {metric}: histogram bin edges differ")
+        self.records += other.records
+        for group, metrics in other.groups.items():
+            own = self.groups.setdefault(group, {})
+            for metric, stats in metrics.items():
+                if metric in own:
+                    own[metric].merge(stats)
+                else:
+                    own[metric] = MetricStats.from_dict(stats.to_dict())
+        return self
+
+    def summary(self):
+        return {
+            group: {metric: stats.summary() for metric, stats in sorted(metrics.items())}
+            for group, metrics in sorted(self.groups.items())
+        }
+
+    def to_dict(self):
+        return {
+            'k': self.k,
+            'records': self.records,
+            'groups': {
+                group: {metric: stats.to_dict() for metric, stats in metrics.items()}
+                for group, metrics in self.groups.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict) or not isinstance(data.get('groups', {}), dict):
+            raise ValueError("Distribution stats must be a JSON object with a 'groups' object")
+        for group, metrics in data.get('groups', {}).items():
+            if not isinstance(metrics, dict):
+                raise ValueError(f"Metrics for group {group} must be a JSON object")
+        stats = cls(data.get('k', DEFAULT_K))
+        stats.records = data.get('records', 0)
+        stats.groups = {
+            group: {metric: MetricStats.from_dict(m) for metric, m in metrics.items()}
+            for group, metrics in data.get('groups', {}).items()
+        }
+        return stats
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+def _parse_int(value):
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _duration_days(record):
+    start_str = record.get('project_start_date')
+    completion_str = record.get('project_completion_date')
+    if not start_str or not completion_str:
+        return None
+    try:
+        start = datetime.strptime(start_str.split('T')[0], "%Y-%m-%d")
+        completion = datetime.strptime(completion_str.split('T')[0], "%Y-%m-%d")
+    except ValueError:
+        return None
+    return (completion - start).days
+
+
+def print_summary(stats):
+    print(f"Distribution statistics over {stats.records} records")
+    for group, metrics in stats.summary().items():
+        print(f"\n{group}")
+        for metric, s in metrics.items():
+            print(f"  {metric}: n={s['count']} median={s['median']} p90={s['p90']} "
+                  f"(min {s['min']}, max {s['max']})")
+
+
+def main(argv):
+    try:
+        if len(argv) >= 4 and argv[1] == 'merge':
+            output_file, input_files = argv[2], argv[3:]
+            combined = DistributionStats.load(input_files[0])
+            for path in input_files[1:]:
+                combined.merge(DistributionStats.load(path))
+            combined.save(output_file)
+            print(f"Merged {len(input_files)} files ({combined.records} records) into {output_file}")
+            return 0
+        if len(argv) == 3 and argv[1] == 'summary':
+            print_summary(DistributionStats.load(argv[2]))
+            return 0
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        print(f"Error: {e}")
+        return 1
+
+    print("Usage: housing_stats_sketches.py merge OUTPUT INPUT [INPUT ...]")
+    print("       housing_stats_sketches.py summary FILE")
+    return 1
+
+
+if __name__ == "__main__":
+    exit(main(sys.argv))
@@ -107,9 +107,10 @@ export async function generateHuggingFaceChatResponse({ message, context, conver
       
       console.log("Extracted parameters:", { location, income, unitSize, householdSize });
       
-      // Get listings from database
-      const allListings = scrapersApi.getAllListings();
-      console.log(`Retrieved ${allListings.length} listings from database`);
+      // Get listings that are still open; the deadline check below is kept
+      // for the listings file fallback, which compares full timestamps
+      const allListings = await scrapersApi.getOpenListings();
+      console.log(`Retrieved ${allListings.length} open listings from database`);
       
       // Filter listings manually based on extracted parameters
       let filteredListings = [...allListings];
@@ -6,6 +6,7 @@ import { db } from "./db";
 import { users } from "@shared/schema";
 import { initializeWeaviateWithKnowledge } from "./weaviateRag";
 import { scheduleAllScrapers } from "./scrapers";
+import { startDataService } from "./scrapers/dataService";
 
 // Initialize a default user if no users exist
 async function initializeDefaultUser() {
@@ -65,6 +66,10 @@ app.use((req, res, next) => {
 });
 
 (async () => {
+  // Start the Python service that keeps the housing data in memory;
+  // listing queries fall back to the data files until it is up
+  startDataService();
+  
   // Initialize database with default user if needed
   await initializeDefaultUser();
   
@@ -346,9 +346,9 @@ export async function registerRoutes(app: Express): Promise<Server> {
   // ----- Housing Listings API Endpoints -----
   
   // Get all housing listings
-  app.get("/api/housing/listings", (_req: Request, res: Response) => {
+  app.get("/api/housing/listings", async (_req: Request, res: Response) => {
     try {
-      const listings = scrapersApi.getAllListings();
+      const listings = await scrapersApi.getAllListings();
       res.status(200).json({ listings });
     } catch (error) {
       console.error("Error retrieving housing listings:", error);
@@ -357,9 +357,9 @@ export async function registerRoutes(app: Express): Promise<Server> {
   });
   
   // Get open housing listings (with future deadlines)
-  app.get("/api/housing/listings/open", (_req: Request, res: Response) => {
+  app.get("/api/housing/listings/open", async (_req: Request, res: Response) => {
     try {
-      const openListings = scrapersApi.getOpenListings();
+      const openListings = await scrapersApi.getOpenListings();
       res.status(200).json({ listings: openListings });
     } catch (error) {
       console.error("Error retrieving open housing listings:", error);
@@ -368,14 +368,14 @@ export async function registerRoutes(app: Express): Promise<Server> {
   });
   
   // Search housing listings
-  app.get("/api/housing/search", (req: Request, res: Response) => {
+  app.get("/api/housing/search", async (req: Request, res: Response) => {
     try {
       const query = req.query.q as string;
       if (!query) {
         return res.status(400).json({ error: "Search query is required" });
       }
       
-      const results = scrapersApi.searchListings(query);
+      const results = await scrapersApi.searchListings(query);
       res.status(200).json({ results });
     } catch (error) {
       console.error("Error searching housing listings:", error);
@@ -384,14 +384,14 @@ export async function registerRoutes(app: Express): Promise<Server> {
   });
   
   // Get listings by AMI range
-  app.get("/api/housing/listings/ami/:percentage", (req: Request, res: Response) => {
+  app.get("/api/housing/listings/ami/:percentage", async (req: Request, res: Response) => {
     try {
       const amiPercentage = parseInt(req.params.percentage);
       if (isNaN(amiPercentage)) {
         return res.status(400).json({ error: "Invalid AMI percentage" });
       }
       
-      const listings = scrapersApi.getListingsByAMI(amiPercentage);
+      const listings = await scrapersApi.getListingsByAMI(amiPercentage);
       res.status(200).json({ listings });
     } catch (error) {
       console.error("Error retrieving listings by AMI:", error);
@@ -400,14 +400,14 @@ export async function registerRoutes(app: Express): Promise<Server> {
   });
   
   // Get listings by unit size
-  app.get("/api/housing/listings/unit-size/:size", (req: Request, res: Response) => {
+  app.get("/api/housing/listings/unit-size/:size", async (req: Request, res: Response) => {
     try {
       const unitSize = req.params.size;
       if (!unitSize) {
         return res.status(400).json({ error: "Unit size is required" });
       }
       
-      const listings = scrapersApi.getListingsByUnitSize(unitSize);
+      const listings = await scrapersApi.getListingsByUnitSize(unitSize);
       res.status(200).json({ listings });
     } catch (error) {
       console.error("Error retrieving listings by unit size:", error);
@@ -3,6 +3,7 @@ import fs from 'fs';
 import { fileURLToPath } from 'url';
 import { HousingListing } from './types';
 import { runAllScrapersNow } from './index';
+import { queryDataService, reloadDataService } from './dataService';
 
 // Get the directory name in ESM
 const __filename = fileURLToPath(import.meta.url);
@@ -33,10 +34,13 @@ function initializeFiles() {
   }
 }
 
+// Only warn once when the data service is unavailable
+let warnedDataServiceFallback = false;
+
 /**
- * Get all housing listings
+ * Read all housing listings from the listings file
  */
-export function getAllListings(): HousingListing[] {
+function readListingsFile(): HousingListing[] {
   try {
     initializeFiles();
     
@@ -52,6 +56,34 @@ export function getAllListings(): HousingListing[] {
   }
 }
 
+/**
+ * Run a listings filter in the in-memory data service, which returns only the
+ * matching records. When the service is unavailable, apply `fallback` to the
+ * listings file instead.
+ */
+async function queryListings(
+  predicates: Record<string, unknown>,
+  fallback: (listings: HousingListing[]) => HousingListing[],
+): Promise<HousingListing[]> {
+  try {
+    const result = await queryDataService({ op: 'filter', dataset: 'listings', limit: null, ...predicates });
+    return result.records;
+  } catch (error) {
+    if (!warnedDataServiceFallback) {
+      console.warn('Housing data service unavailable, reading listings file:', error);
+      warnedDataServiceFallback = true;
+    }
+    return fallback(readListingsFile());
+  }
+}
+
+/**
+ * Get all housing listings
+ */
+export async function getAllListings(): Promise<HousingListing[]> {
+  return queryListings({}, listings => listings);
+}
+
 /**
  * Get all HPD rules
  */
@@ -74,12 +106,10 @@ export function getAllHPDRules(): any[] {
 /**
  * Get listings by AMI range
  */
-export function getListingsByAMI(amiPercentage: number): HousingListing[] {
+export async function getListingsByAMI(amiPercentage: number): Promise<HousingListing[]> {
   try {
-    const listings = getAllListings();
-    
-    // Filter listings by AMI range
-    return listings.filter(listing => {
+    // The data service parses each listing's AMI range once, at load time
+    return await queryListings({ ami: amiPercentage }, listings => listings.filter(listing => {
       // Parse AMI range from "40%-80% AMI" format
       const amiRangeMatch = listing.ami_range.match(/(\d+)%\s*-\s*(\d+)%/);
       
@@ -92,7 +122,7 @@ export function getListingsByAMI(amiPercentage: number): HousingListing[] {
       }
       
       return false;
-    });
+    }));
   } catch (error) {
     console.error('Error filtering listings by AMI:', error);
     return [];
@@ -102,19 +132,19 @@ export function getListingsByAMI(amiPercentage: number): HousingListing[] {
 /**
  * Search for listings by keywords in project name or description
  */
-export function searchListings(query: string): HousingListing[] {
+export async function searchListings(query: string): Promise<HousingListing[]> {
   try {
-    const listings = getAllListings();
     const lowerQuery = query.toLowerCase();
     
     // Search in project name, description, and address
-    return listings.filter(listing => {
+    const search = { text: query, fields: ['project_name', 'project_description', 'address'] };
+    return await queryListings({ search }, listings => listings.filter(listing => {
       return (
         listing.project_name.toLowerCase().includes(lowerQuery) ||
         listing.project_description.toLowerCase().includes(lowerQuery) ||
         listing.address.toLowerCase().includes(lowerQuery)
       );
-    });
+    }));
   } catch (error) {
     console.error('Error searching listings:', error);
     return [];
@@ -124,16 +154,16 @@ export function searchListings(query: string): HousingListing[] {
 /**
  * Get listings by unit size (e.g., "1BR", "2BR", "Studio")
  */
-export function getListingsByUnitSize(unitSize: string): HousingListing[] {
+export async function getListingsByUnitSize(unitSize: string): Promise<HousingListing[]> {
   try {
-    const listings = getAllListings();
     const normalizedUnitSize = unitSize.toLowerCase().trim();
     
-    return listings.filter(listing => {
+    const contains = { unit_sizes: normalizedUnitSize };
+    return await queryListings({ contains }, listings => listings.filter(listing => {
       return listing.unit_sizes.some(size => 
         size.toLowerCase().includes(normalizedUnitSize)
       );
-    });
+    }));
   } catch (error) {
     console.error('Error filtering listings by unit size:', error);
     return [];
@@ -143,12 +173,13 @@ export function getListingsByUnitSize(unitSize: string): HousingListing[] {
 /**
  * Get listings that are still open for applications (deadline has not passed)
  */
-export function getOpenListings(): HousingListing[] {
+export async function getOpenListings(): Promise<HousingListing[]> {
   try {
-    const listings = getAllListings();
     const today = new Date();
     
-    return listings.filter(listing => {
+    // Deadlines are ISO dates, so the data service can compare them as strings
+    const range = { application_deadline: [today.toISOString().split('T')[0], null] };
+    return await queryListings({ range }, listings => listings.filter(listing => {
       try {
         // Try to parse the deadline date
         const deadline = new Date(listing.application_deadline);
@@ -157,7 +188,7 @@ export function getOpenListings(): HousingListing[] {
         // If we can't parse the date, include the listing to be safe
         return true;
       }
-    });
+    }));
   } catch (error) {
     console.error('Error filtering open listings:', error);
     return [];
@@ -208,6 +239,9 @@ export function getHPDRulesByCategory(category: string): any[] {
 export async function runScrapersOnDemand(): Promise<{ success: boolean, message: string }> {
   try {
     await runAllScrapersNow();
+    // Make the new listings visible to the next query instead of after the
+    // data service's next poll
+    await reloadDataService();
     return { success: true, message: 'Scrapers executed successfully' };
   } catch (error) {
     console.error('Error running scrapers on-demand:', error);
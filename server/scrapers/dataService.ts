@@ -0,0 +1,186 @@
+import http from 'http';
+import { spawn, type ChildProcess } from 'child_process';
+
+// Where the Python data service (housing_data_service.py) listens
+const SERVICE_HOST = process.env.HOUSING_DATA_SERVICE_HOST || '127.0.0.1';
+const SERVICE_PORT = parseInt(process.env.HOUSING_DATA_SERVICE_PORT || '5055');
+const SERVICE_SOCKET = process.env.HOUSING_DATA_SERVICE_SOCKET;
+
+const REQUEST_TIMEOUT_MS = 2000;
+// Must not exceed MAX_BATCH_SIZE in housing_data_service.py
+const MAX_BATCH_SIZE = 100;
+
+export interface DataServiceRequest {
+  op: 'filter' | 'aggregate' | 'lookup';
+  dataset?: 'projects' | 'listings';
+  [key: string]: unknown;
+}
+
+interface DataServiceResult {
+  ok: boolean;
+  data?: any;
+  error?: string;
+}
+
+interface PendingRequest {
+  request: DataServiceRequest;
+  resolve: (data: any) => void;
+  reject: (error: Error) => void;
+}
+
+let pending: PendingRequest[] = [];
+let flushScheduled = false;
+let serviceProcess: ChildProcess | null = null;
+
+/**
+ * POST a JSON body to the data service and resolve with the parsed response
+ */
+function postJson(requestPath: string, payload: unknown): Promise<any> {
+  return new Promise((resolve, reject) => {
+    const body = JSON.stringify(payload);
+    const target = SERVICE_SOCKET
+      ? { socketPath: SERVICE_SOCKET }
+      : { host: SERVICE_HOST, port: SERVICE_PORT };
+
+    const req = http.request({
+      ...target,
+      path: requestPath,
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Content-Length': Buffer.byteLength(body),
+      },
+      timeout: REQUEST_TIMEOUT_MS,
+    }, (res) => {
+      let data = '';
+      res.setEncoding('utf8');
+      res.on('data', (chunk) => { data += chunk; });
+      res.on('end', () => {
+        if (res.statusCode !== 200) {
+          reject(new Error(`Data service returned ${res.statusCode}: ${data}`));
+          return;
+        }
+        try {
+          resolve(JSON.parse(data));
+        } catch (error) {
+          reject(error as Error);
+        }
+      });
+    });
+
+    req.on('timeout', () => req.destroy(new Error('Data service request timed out')));
+    req.on('error', reject);
+    req.end(body);
+  });
+}
+
+/**
+ * Send one batch of requests to POST /query
+ */
+async function postBatch(requests: DataServiceRequest[]): Promise<DataServiceResult[]> {
+  const response = await postJson('/query', { requests });
+  return response.results;
+}
+
+/**
+ * Send every request queued during this event loop turn in as few batches as possible
+ */
+async function flushPending(): Promise<void> {
+  flushScheduled = false;
+  const queued = pending;
+  pending = [];
+
+  for (let i = 0; i < queued.length; i += MAX_BATCH_SIZE) {
+    const batch = queued.slice(i, i + MAX_BATCH_SIZE);
+    try {
+      const results = await postBatch(batch.map(item => item.request));
+      batch.forEach((item, index) => {
+        const result = results[index];
+        if (result && result.ok) {
+          item.resolve(result.data);
+        } else {
+          item.reject(new Error(result?.error || 'Missing result from data service'));
+        }
+      });
+    } catch (error) {
+      batch.forEach(item => item.reject(error as Error));
+    }
+  }
+}
+
+/**
+ * Query the in-memory data service. Requests made in the same event loop
+ * turn are sent together as one batch. Rejects if the service is unavailable,
+ * so callers should fall back to reading the data files.
+ */
+export function queryDataService(request: DataServiceRequest): Promise<any> {
+  return new Promise((resolve, reject) => {
+    pending.push({ request, resolve, reject });
+    if (!flushScheduled) {
+      flushScheduled = true;
+      setImmediate(flushPending);
+    }
+  });
+}
+
+/**
+ * Ask the data service to reload the data files now instead of waiting for
+ * its next poll. Call this after writing new data so queries see it at once.
+ */
+export async function reloadDataService(): Promise<boolean> {
+  try {
+    const response = await postJson('/reload', {});
+    return response.reloaded;
+  } catch (error) {
+    // Not running: queries read the data files directly, so nothing is stale
+    return false;
+  }
+}
+
+/**
+ * Start housing_data_service.py as a child process of the server.
+ * Set HOUSING_DATA_SERVICE_AUTOSTART=false when the service is run separately.
+ */
+export function startDataService(): void {
+  if (process.env.HOUSING_DATA_SERVICE_AUTOSTART === 'false' || serviceProcess) {
+    return;
+  }
+
+  const args = SERVICE_SOCKET
+    ? ['housing_data_service.py', '--socket', SERVICE_SOCKET]
+    : ['housing_data_service.py', '--host', SERVICE_HOST, '--port', String(SERVICE_PORT)];
+
+  try {
+    serviceProcess = spawn(process.env.PYTHON || 'python3', args, {
+      // housing_data_service.py reads ./data relative to the project root,
+      // which is where npm runs the server from in dev and production
+      cwd: process.cwd(),
+      stdio: 'inherit',
+    });
+  } catch (error) {
+    console.error('Error starting housing data service:', error);
+    return;
+  }
+
+  serviceProcess.on('error', (error) => {
+    console.error('Error starting housing data service:', error);
+    serviceProcess = null;
+  });
+
+  serviceProcess.on('exit', (code) => {
+    console.log(`Housing data service exited with code ${code}; listing queries read the data files if no service is reachable`);
+    serviceProcess = null;
+  });
+
+  // Don't leave the service running (and holding its port) after the server
+  // stops. Node doesn't emit 'exit' when killed by a signal with the default
+  // handlers, so stop the child and then re-raise the signal.
+  const stopService = () => serviceProcess?.kill();
+  process.on('exit', stopService);
+  for (const signal of ['SIGINT', 'SIGTERM'] as const) {
+    process.once(signal, () => {
+      stopService();
+      process.kill(process.pid, signal);
+    });
+  }
+}
@@ -4,6 +4,7 @@ import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import { HousingListing } from './types';
+import { reloadDataService } from './dataService';
 
 // Get the directory name in ESM
 const __filename = fileURLToPath(import.meta.url);
@@ -50,6 +51,8 @@ function saveListings(listings: HousingListing[]): void {
   try {
     fs.writeFileSync(LISTINGS_FILE, JSON.stringify(listings, null, 2));
     console.log(`Saved ${listings.length} listings to file`);
+    // Serve the new listings right away instead of after the next poll
+    reloadDataService();
   } catch (error) {
     console.error('Error saving listings to file:', error);
   }
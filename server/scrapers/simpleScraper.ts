@@ -2,6 +2,7 @@ import fs from 'fs';
 import path from 'path';
 import { fileURLToPath } from 'url';
 import { HousingListing } from './types';
+import { reloadDataService } from './dataService';
 
 // Get the directory name in ESM
 const __filename = fileURLToPath(import.meta.url);
@@ -117,6 +118,9 @@ export function initializeDataFiles(): void {
   // Always use sample rules data since we don't have real rules data
   fs.writeFileSync(HPD_RULES_FILE, JSON.stringify(sampleRules, null, 2));
   console.log('Created/updated rules file with sample data');
+  
+  // Serve any new listings right away instead of after the next poll
+  reloadDataService();
 }
 
 /**